@@ -6,12 +6,24 @@ This module provides functionality to read and parse BMAD method definitions
 from the BMAD-method folder and its subfolders.
 """
 
-import json
+import logging
 import os
 import re
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Template variables like {{width}} in method step parameters
+_TEMPLATE_RE = re.compile(r'\{\{(\w+)\}\}')
+
+# Fields every BMAD method definition must provide
+REQUIRED_METHOD_FIELDS = frozenset({"name", "description", "category", "steps"})
+
 
 class BMADMethodReader:
     """Reader for BMAD method definitions."""
@@ -25,49 +37,112 @@ class BMADMethodReader:
         """
         self.bmad_folder = Path(bmad_folder)
         self._methods_cache = None
+        self._methods_by_category = {}
+        self._cache_fingerprint = None
+        # Serializes cache refreshes when called from several threads
+        self._cache_lock = threading.Lock()
+        
+        # Resolve the folder once, relative to the repository root
+        repo_root = Path(__file__).resolve().parent.parent
+        self._methods_folder = repo_root / self.bmad_folder
     
     def get_methods_folder_path(self) -> Path:
         """Get the absolute path to the BMAD methods folder."""
-        # Get the path relative to the script location
-        script_dir = Path(__file__).parent
-        repo_root = script_dir.parent
-        return repo_root / self.bmad_folder
+        return self._methods_folder
     
     def read_all_methods(self, force_refresh: bool = False) -> Dict[str, Dict[str, Any]]:
         """
         Read all BMAD method definitions from the folder structure.
         
+        The cached methods are reused until a method file is added, removed
+        or changed on disk.
+        
         Args:
             force_refresh: Force re-reading from disk
             
         Returns:
             Dictionary mapping method names to method definitions
         """
-        if self._methods_cache is not None and not force_refresh:
+        with self._cache_lock:
+            return self._read_all_methods_locked(force_refresh)
+    
+    def _read_all_methods_locked(self, force_refresh: bool) -> Dict[str, Dict[str, Any]]:
+        """Refresh the method cache if needed; the cache lock must be held."""
+        json_paths, fingerprint = self._scan_methods_folder()
+        if (
+            self._methods_cache is not None
+            and not force_refresh
+            and fingerprint == self._cache_fingerprint
+        ):
             return self._methods_cache
         
         methods = {}
         methods_folder = self.get_methods_folder_path()
         
-        if not methods_folder.exists():
-            return {}
+        # Read the method files in parallel since the work is dominated by
+        # file I/O
+        json_files = [Path(path) for path in json_paths]
+        max_workers = max(1, min(32, len(json_files)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._read_method_file, json_files))
         
-        # Walk through all subfolders
-        for json_file in methods_folder.rglob("*.json"):
+        for json_file, method in zip(json_files, results):
             try:
-                method = self._read_method_file(json_file)
                 if method:
                     # Add folder path info for categorization
                     relative_path = json_file.relative_to(methods_folder)
                     method["folder"] = str(relative_path.parent)
                     methods[method["name"]] = method
             except Exception as e:
-                print(f"Error reading method file {json_file}: {e}")
+                logger.warning("Error reading method file %s: %s", json_file, e)
                 continue
         
+        # Index methods by category so filtered listings skip the full scan
+        methods_by_category = {}
+        for method in methods.values():
+            methods_by_category.setdefault(method.get("category"), []).append(method)
+        
         self._methods_cache = methods
+        self._methods_by_category = methods_by_category
+        self._cache_fingerprint = fingerprint
         return methods
     
+    def _scan_methods_folder(self) -> Tuple[List[str], Tuple[Tuple[str, int, int], ...]]:
+        """
+        Find all method files with a single os.scandir walk.
+        
+        Returns:
+            Tuple of the sorted method file paths and a fingerprint of the
+            folder contents: the path, modification time (in nanoseconds)
+            and size of every method file. Any added, removed, renamed or
+            rewritten file changes it, including files replaced with older
+            content and an older modification time.
+        """
+        file_stats = []
+        pending = [str(self._methods_folder)]
+        
+        while pending:
+            folder = pending.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.endswith(".json"):
+                            # A dangling symlink or a file removed since the
+                            # listing only drops that one entry
+                            try:
+                                stat = entry.stat()
+                            except OSError as e:
+                                logger.warning("Error reading method file %s: %s", entry.path, e)
+                                continue
+                            file_stats.append((entry.path, stat.st_mtime_ns, stat.st_size))
+            except (FileNotFoundError, PermissionError):
+                continue
+        
+        file_stats.sort()
+        return [path for path, _, _ in file_stats], tuple(file_stats)
+    
     def _read_method_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
         Read a single BMAD method file.
@@ -79,22 +154,22 @@ class BMADMethodReader:
             Method definition or None if invalid
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                method = json.load(f)
+            # Method files are small and read once, so read the raw bytes in
+            # one go and let the parser handle the UTF-8 decoding.
+            method = orjson.loads(file_path.read_bytes())
             
             # Validate required fields
-            required_fields = ["name", "description", "category", "steps"]
-            for field in required_fields:
-                if field not in method:
-                    print(f"Missing required field '{field}' in {file_path}")
-                    return None
+            missing_fields = REQUIRED_METHOD_FIELDS.difference(method)
+            if missing_fields:
+                logger.warning("Missing required fields %s in %s", sorted(missing_fields), file_path)
+                return None
             
             return method
-        except json.JSONDecodeError as e:
-            print(f"Invalid JSON in {file_path}: {e}")
+        except orjson.JSONDecodeError as e:
+            logger.warning("Invalid JSON in %s: %s", file_path, e)
             return None
         except Exception as e:
-            print(f"Error reading {file_path}: {e}")
+            logger.warning("Error reading %s: %s", file_path, e)
             return None
     
     def get_method(self, method_name: str) -> Optional[Dict[str, Any]]:
@@ -120,14 +195,13 @@ class BMADMethodReader:
         Returns:
             List of method definitions
         """
-        methods = self.read_all_methods()
-        result = []
-        
-        for method in methods.values():
-            if category is None or method.get("category") == category:
-                result.append(method)
-        
-        return result
+        with self._cache_lock:
+            methods = self._read_all_methods_locked(False)
+            
+            if category is None:
+                return list(methods.values())
+            
+            return list(self._methods_by_category.get(category, []))
     
     def list_folders(self) -> List[str]:
         """
@@ -138,14 +212,15 @@ class BMADMethodReader:
         """
         methods_folder = self.get_methods_folder_path()
         
-        if not methods_folder.exists():
+        try:
+            with os.scandir(methods_folder) as entries:
+                folders = [
+                    entry.name for entry in entries
+                    if entry.is_dir() and not entry.name.startswith('.')
+                ]
+        except (FileNotFoundError, PermissionError):
             return []
         
-        folders = []
-        for item in methods_folder.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                folders.append(item.name)
-        
         return sorted(folders)
     
     def substitute_parameters(self, method: Dict[str, Any], parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -159,9 +234,9 @@ class BMADMethodReader:
         Returns:
             Method with substituted parameters
         """
-        # Deep copy the method to avoid modifying the original
-        import copy
-        substituted_method = copy.deepcopy(method)
+        # Deep copy the method to avoid modifying the original. Methods are
+        # plain JSON data, so a JSON round trip is much cheaper than deepcopy.
+        substituted_method = orjson.loads(orjson.dumps(method))
         
         # Apply default values for missing parameters
         method_params = method.get("parameters", {})
@@ -193,9 +268,12 @@ class BMADMethodReader:
         Returns:
             Substituted value
         """
+        # Most step parameters (e.g. "xy") contain no template at all
+        if "{{" not in template:
+            return template
+        
         # Find all template variables
-        pattern = r'\{\{(\w+)\}\}'
-        matches = re.findall(pattern, template)
+        matches = _TEMPLATE_RE.findall(template)
         
         if not matches:
             return template
@@ -209,14 +287,13 @@ class BMADMethodReader:
                 raise ValueError(f"Missing required parameter: {param_name}")
         
         # Multiple variables or partial substitution, return as string
-        result = template
-        for var_name in matches:
-            if var_name in parameters:
-                result = result.replace(f"{{{{{var_name}}}}}", str(parameters[var_name]))
-            else:
+        def replace(match) -> str:
+            var_name = match.group(1)
+            if var_name not in parameters:
                 raise ValueError(f"Missing required parameter: {var_name}")
+            return str(parameters[var_name])
         
-        return result
+        return _TEMPLATE_RE.sub(replace, template)
 
 
 # Global instance
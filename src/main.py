@@ -6,13 +6,22 @@ This module implements a FastAPI server that exposes Fusion 360 tools as callabl
 It also implements the Model Context Protocol (MCP) for integration with Cline.
 """
 
-import json
+import argparse
+import asyncio
+import functools
 import os
+import queue
 import sys
-from typing import Dict, Any, List, Optional, Union
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable, ClassVar, Dict, Any, List, Literal, Optional, Tuple, Type, Union
 
+import anyio
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel, Field
 
 # Import script generator
@@ -27,13 +36,44 @@ from script_generator import (
 # Import BMAD reader
 from bmad_reader import bmad_reader
 
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# Worker threads available for script generation and other blocking calls
+THREAD_POOL_SIZE = 64
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Size the worker thread pool and warm the BMAD method cache before serving."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREAD_POOL_SIZE
+    
+    # Read the method files up front so the first requests do not pay for it
+    await anyio.to_thread.run_sync(bmad_reader.read_all_methods)
+    yield
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Fusion 360 MCP Server",
     description="MCP server for Fusion 360 API integration",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
+# Generated scripts and the tool and method listings are text-heavy, so
+# compress larger responses for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Maximum number of tool calls accepted by /call_tools_batch
+MAX_BATCH_SIZE = 100
+
 # Define request/response models
 class ToolParameter(BaseModel):
     """Parameter for a tool call."""
@@ -58,6 +98,16 @@ class MultiToolCallRequest(BaseModel):
     )
 
 
+class BatchToolCallRequest(BaseModel):
+    """Request to call multiple independent tools in one batch."""
+    
+    tool_calls: List[ToolCallRequest] = Field(
+        ...,
+        max_length=MAX_BATCH_SIZE,
+        description="List of independent tool calls, each generating its own script",
+    )
+
+
 class ScriptResponse(BaseModel):
     """Response containing a generated script."""
     
@@ -65,6 +115,22 @@ class ScriptResponse(BaseModel):
     message: str = Field(default="Success", description="Status message")
 
 
+class BatchToolCallResult(BaseModel):
+    """Result of one tool call in a batch."""
+    
+    script: Optional[str] = Field(None, description="The generated script, if successful")
+    error: Optional[str] = Field(None, description="Error message, if the call failed")
+    status: int = Field(..., description="HTTP-style status code for the call")
+
+
+class BatchToolCallResponse(BaseModel):
+    """Response containing one result per batched tool call."""
+    
+    results: List[BatchToolCallResult] = Field(
+        ..., description="Results in the same order as the requested tool calls"
+    )
+
+
 class ToolInfo(BaseModel):
     """Information about a tool."""
     
@@ -116,88 +182,201 @@ class BMADFolderListResponse(BaseModel):
     folders: List[str] = Field(..., description="List of available folders")
 
 
+# The tool registry is static, so validate and serialize the /tools payload
+# once at import time instead of on every request
+TOOL_LIST_RESPONSE_BODY = orjson.dumps(
+    ToolListResponse(tools=TOOL_REGISTRY).model_dump(mode="json")
+)
+
+
+def _http_errors(message: str, client_errors: Tuple[Type[Exception], ...] = ()):
+    """
+    Convert exceptions raised by an endpoint into HTTP errors.
+    
+    Args:
+        message: Prefix for the detail of the 500 response.
+        client_errors: Exception types that signal invalid input and map
+            to a 400 response with the exception message as detail.
+        
+    Returns:
+        A decorator for async endpoint functions.
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except client_errors as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{message}: {str(e)}")
+        return wrapper
+    return decorator
+
+
 # Define API routes
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {"message": "Fusion 360 MCP Server is running"}
+    return FastJSONResponse({"message": "Fusion 360 MCP Server is running"})
 
 
-@app.get("/tools", response_model=ToolListResponse)
+@app.get("/tools", responses={200: {"model": ToolListResponse}})
 async def list_tools():
     """List all available tools."""
-    return {"tools": TOOL_REGISTRY}
-
-
-@app.post("/call_tool", response_model=ScriptResponse)
-async def call_tool(request: ToolCallRequest):
-    """Call a single tool and generate a Fusion 360 script."""
-    try:
-        script = generate_script(request.tool_name, request.parameters)
-        return {"script": script, "message": "Success"}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating script: {str(e)}")
+    return Response(content=TOOL_LIST_RESPONSE_BODY, media_type="application/json")
+
+
+@app.post(
+    "/call_tool",
+    responses={
+        200: {
+            "model": ScriptResponse,
+            "content": {"text/plain": {"schema": {"type": "string"}}},
+            "description": "The generated script, as JSON or with ?format=text as plain text",
+        }
+    },
+)
+@_http_errors("Error generating script", client_errors=(ValueError,))
+async def call_tool(
+    request: ToolCallRequest,
+    response_format: Literal["json", "text"] = Query(
+        "json", alias="format", description="Return the script as JSON or plain text"
+    ),
+):
+    """
+    Call a single tool and generate a Fusion 360 script.
+    
+    With ``?format=text`` the script is returned as the plain-text body and
+    the status message in the X-Status header, skipping the JSON encoding.
+    """
+    script = await anyio.to_thread.run_sync(generate_script, request.tool_name, request.parameters)
+    if response_format == "text":
+        return PlainTextResponse(content=script, headers={"X-Status": "Success"})
+    return FastJSONResponse({"script": script, "message": "Success"})
 
 
-@app.post("/call_tools", response_model=ScriptResponse)
+@app.post("/call_tools", responses={200: {"model": ScriptResponse}})
+@_http_errors("Error generating script", client_errors=(ValueError,))
 async def call_tools(request: MultiToolCallRequest):
     """Call multiple tools in sequence and generate a Fusion 360 script."""
-    try:
-        tool_calls = [
-            {"tool_name": call.tool_name, "parameters": call.parameters}
+    tool_calls = (
+        {"tool_name": call.tool_name, "parameters": call.parameters}
+        for call in request.tool_calls
+    )
+    script = await anyio.to_thread.run_sync(generate_multi_tool_script, tool_calls)
+    return FastJSONResponse({"script": script, "message": "Success"})
+
+
+@app.post("/call_tools_batch", responses={200: {"model": BatchToolCallResponse}})
+async def call_tools_batch(request: BatchToolCallRequest):
+    """Call independent tools concurrently, generating one script per tool."""
+    outcomes = await asyncio.gather(
+        *(
+            anyio.to_thread.run_sync(generate_script, call.tool_name, call.parameters)
             for call in request.tool_calls
-        ]
-        script = generate_multi_tool_script(tool_calls)
-        return {"script": script, "message": "Success"}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating script: {str(e)}")
+        ),
+        return_exceptions=True,
+    )
+    
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, ValueError):
+            results.append({"script": None, "error": str(outcome), "status": 400})
+        elif isinstance(outcome, BaseException):
+            results.append({
+                "script": None,
+                "error": f"Error generating script: {str(outcome)}",
+                "status": 500,
+            })
+        else:
+            results.append({"script": outcome, "error": None, "status": 200})
+    return FastJSONResponse({"results": results})
+
 
+def _bmad_methods_body(category: Optional[str]) -> bytes:
+    """
+    Get the serialized /bmad/methods response for a category.
+    
+    Args:
+        category: Category to filter by, or None for all methods.
+        
+    Returns:
+        The JSON response body.
+    """
+    methods = bmad_reader.list_methods_by_category(category)
+    # Methods come from bmad_reader, which already validated them, so
+    # build the BMADMethodInfo-shaped dicts directly instead of running
+    # them through the response model
+    method_infos = [
+        {
+            "name": method["name"],
+            "description": method["description"],
+            "category": method["category"],
+            "folder": method.get("folder", ""),
+            "parameters": method.get("parameters", {}),
+            "steps": method.get("steps", []),
+        }
+        for method in methods
+    ]
+    return orjson.dumps({"methods": method_infos})
 
-@app.get("/bmad/methods", response_model=BMADMethodListResponse)
+
+@app.get("/bmad/methods", responses={200: {"model": BMADMethodListResponse}})
+@_http_errors("Error listing BMAD methods")
 async def list_bmad_methods(category: Optional[str] = None):
     """List all available BMAD methods, optionally filtered by category."""
-    try:
-        methods = bmad_reader.list_methods_by_category(category)
-        method_infos = []
-        for method in methods:
-            method_info = BMADMethodInfo(
-                name=method["name"],
-                description=method["description"],
-                category=method["category"],
-                folder=method.get("folder", ""),
-                parameters=method.get("parameters", {}),
-                steps=method.get("steps", [])
-            )
-            method_infos.append(method_info)
-        return {"methods": method_infos}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error listing BMAD methods: {str(e)}")
+    # The reader scans the methods folder on every call, so keep the
+    # blocking file system work off the event loop
+    body = await anyio.to_thread.run_sync(_bmad_methods_body, category)
+    return Response(content=body, media_type="application/json")
 
 
-@app.get("/bmad/folders", response_model=BMADFolderListResponse)
+@app.get("/bmad/folders", responses={200: {"model": BMADFolderListResponse}})
+@_http_errors("Error listing BMAD folders")
 async def list_bmad_folders():
     """List all available BMAD method folders."""
-    try:
-        folders = bmad_reader.list_folders()
-        return {"folders": folders}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error listing BMAD folders: {str(e)}")
+    folders = await anyio.to_thread.run_sync(bmad_reader.list_folders)
+    return FastJSONResponse({"folders": folders})
 
 
-@app.post("/bmad/call_method", response_model=ScriptResponse)
+@app.post("/bmad/call_method", responses={200: {"model": ScriptResponse}})
+@_http_errors("Error generating script", client_errors=(ValueError,))
 async def call_bmad_method(request: BMADMethodCallRequest):
     """Call a BMAD method and generate a Fusion 360 script."""
-    try:
-        script = generate_bmad_method_script(request.method_name, request.parameters)
-        return {"script": script, "message": "Success"}
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating script: {str(e)}")
+    script = await anyio.to_thread.run_sync(
+        generate_bmad_method_script, request.method_name, request.parameters
+    )
+    return FastJSONResponse({"script": script, "message": "Success"})
+
+
+# The tool registry is static, so convert it to the MCP tool format and
+# serialize the list_tools response once at import time
+_MCP_TOOLS_LIST = [
+    {
+        "name": tool["name"],
+        "description": tool["description"],
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                name: {
+                    "type": param["type"],
+                    "description": param["description"],
+                }
+                for name, param in tool["parameters"].items()
+            },
+            "required": [
+                name for name, param in tool["parameters"].items()
+                if "default" not in param
+            ],
+        },
+    }
+    for tool in TOOL_REGISTRY
+]
+_MCP_LIST_TOOLS_RESPONSE = {"result": {"tools": _MCP_TOOLS_LIST}}
+_MCP_LIST_TOOLS_RESPONSE_BYTES = orjson.dumps(_MCP_LIST_TOOLS_RESPONSE)
 
 
 # MCP Server implementation
@@ -209,20 +388,18 @@ class McpServer:
     It wraps the FastAPI server and exposes tools via the MCP protocol.
     """
     
+    # Maps MCP method names to their handlers; filled in after the class body
+    _DISPATCH: ClassVar[Dict[str, Callable[["McpServer", Dict[str, Any]], Dict[str, Any]]]]
+    
     def __init__(self):
         """Initialize the MCP server."""
-        self.tools = {tool["name"]: tool for tool in TOOL_REGISTRY}
-        
-        # Add BMAD methods as tools
-        bmad_methods = bmad_reader.read_all_methods()
-        for method_name, method in bmad_methods.items():
-            # Convert BMAD method to MCP tool format
-            mcp_tool = {
-                "name": f"BMAD_{method_name}",
-                "description": f"BMAD Method: {method['description']}",
-                "parameters": method.get("parameters", {})
-            }
-            self.tools[mcp_tool["name"]] = mcp_tool
+        # The tool registry is static, so bind each registry tool to its
+        # script generator once. BMAD methods can change on disk and are
+        # resolved per call through bmad_reader instead.
+        self._script_generators: Dict[str, Callable[[Dict[str, Any]], str]] = {
+            tool["name"]: functools.partial(generate_script, tool["name"])
+            for tool in TOOL_REGISTRY
+        }
     
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -235,52 +412,29 @@ class McpServer:
             The MCP response.
         """
         method = request.get("method")
+        handler = self._DISPATCH.get(method) if isinstance(method, str) else None
         
-        if method == "list_tools":
-            return self._handle_list_tools()
-        elif method == "call_tool":
-            return self._handle_call_tool(request.get("params", {}))
-        elif method == "list_bmad_methods":
-            return self._handle_list_bmad_methods()
-        elif method == "list_bmad_folders":
-            return self._handle_list_bmad_folders()
-        else:
+        if handler is None:
             return {
                 "error": {
                     "code": -32601,
                     "message": f"Method not found: {method}",
                 }
             }
+        
+        return handler(self, request.get("params", {}))
     
-    def _handle_list_tools(self) -> Dict[str, Any]:
+    def _handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle a list_tools request.
         
+        Args:
+            params: The request parameters (unused).
+            
         Returns:
             The MCP response.
         """
-        tools = []
-        for tool in TOOL_REGISTRY:
-            tools.append({
-                "name": tool["name"],
-                "description": tool["description"],
-                "input_schema": {
-                    "type": "object",
-                    "properties": {
-                        name: {
-                            "type": param["type"],
-                            "description": param["description"],
-                        }
-                        for name, param in tool["parameters"].items()
-                    },
-                    "required": [
-                        name for name, param in tool["parameters"].items()
-                        if "default" not in param
-                    ],
-                },
-            })
-        
-        return {"result": {"tools": tools}}
+        return _MCP_LIST_TOOLS_RESPONSE
     
     def _handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -303,21 +457,19 @@ class McpServer:
                 }
             }
         
-        if tool_name not in self.tools:
-            return {
-                "error": {
-                    "code": -32602,
-                    "message": f"Invalid params: unknown tool: {tool_name}",
-                }
-            }
+        # Registry tools are bound once; BMAD_<method> tools are resolved
+        # against the current BMAD methods by the generator itself
+        method_name = None
+        generate = self._script_generators.get(tool_name)
+        if generate is None:
+            if not isinstance(tool_name, str) or not tool_name.startswith("BMAD_"):
+                return self._unknown_tool_error(tool_name)
+            method_name = tool_name.removeprefix("BMAD_")
         
         try:
-            # Check if it's a BMAD method (prefixed with BMAD_)
-            if tool_name.startswith("BMAD_"):
-                method_name = tool_name[5:]  # Remove "BMAD_" prefix
-                script = generate_bmad_method_script(method_name, arguments)
-            else:
-                script = generate_script(tool_name, arguments)
+            if method_name is not None:
+                generate = functools.partial(generate_bmad_method_script, method_name)
+            script = generate(arguments)
             
             return {
                 "result": {
@@ -330,6 +482,8 @@ class McpServer:
                 }
             }
         except ValueError as e:
+            if method_name is not None and str(e) == f"Unknown BMAD method: {method_name}":
+                return self._unknown_tool_error(tool_name)
             return {
                 "error": {
                     "code": -32602,
@@ -344,10 +498,31 @@ class McpServer:
                 }
             }
     
-    def _handle_list_bmad_methods(self) -> Dict[str, Any]:
+    @staticmethod
+    def _unknown_tool_error(tool_name: Any) -> Dict[str, Any]:
+        """
+        Build the MCP error response for an unknown tool.
+        
+        Args:
+            tool_name: The requested tool name.
+            
+        Returns:
+            The MCP response.
+        """
+        return {
+            "error": {
+                "code": -32602,
+                "message": f"Invalid params: unknown tool: {tool_name}",
+            }
+        }
+    
+    def _handle_list_bmad_methods(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle a list_bmad_methods request.
         
+        Args:
+            params: The request parameters (unused).
+            
         Returns:
             The MCP response.
         """
@@ -362,10 +537,13 @@ class McpServer:
                 }
             }
     
-    def _handle_list_bmad_folders(self) -> Dict[str, Any]:
+    def _handle_list_bmad_folders(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Handle a list_bmad_folders request.
         
+        Args:
+            params: The request parameters (unused).
+            
         Returns:
             The MCP response.
         """
@@ -381,33 +559,183 @@ class McpServer:
             }
 
 
+McpServer._DISPATCH = {
+    "list_tools": McpServer._handle_list_tools,
+    "call_tool": McpServer._handle_call_tool,
+    "list_bmad_methods": McpServer._handle_list_bmad_methods,
+    "list_bmad_folders": McpServer._handle_list_bmad_folders,
+}
+
+
+# Maximum number of MCP responses written to stdout with a single flush
+MCP_MAX_BATCH_SIZE = 64
+
+
+def _read_stdin_lines(lines: "queue.Queue[Optional[bytes]]") -> None:
+    """
+    Feed raw lines from stdin into a queue, followed by None at end of input.
+    
+    Args:
+        lines: The queue consumed by run_mcp_server.
+    """
+    # Read bytes so requests skip the text decoding layer; the JSON parser
+    # decodes UTF-8 itself
+    put = lines.put
+    readline = sys.stdin.buffer.readline
+    try:
+        while True:
+            line = readline()
+            if not line:
+                break
+            put(line)
+    finally:
+        # Always end the input, even when reading stdin fails, so
+        # run_mcp_server never waits forever for another line
+        put(None)
+
+
+def _process_mcp_line(server: McpServer, line: bytes) -> Optional[bytes]:
+    """
+    Handle one line of MCP input.
+    
+    Args:
+        server: The MCP server handling the request.
+        line: A JSON-encoded MCP request.
+        
+    Returns:
+        The serialized MCP response, or None if the line could not be handled.
+    """
+    try:
+        request = orjson.loads(line)
+        if request.get("method") == "list_tools":
+            # Static response, serialized once at import time
+            return _MCP_LIST_TOOLS_RESPONSE_BYTES
+        return orjson.dumps(server.handle_request(request))
+    except orjson.JSONDecodeError:
+        sys.stderr.write(f"Error: Invalid JSON: {line.decode('utf-8', 'replace')}\n")
+        sys.stderr.flush()
+    except Exception as e:
+        sys.stderr.write(f"Error: {str(e)}\n")
+        sys.stderr.flush()
+    return None
+
+
 def run_mcp_server():
     """Run the MCP server."""
     server = McpServer()
     
-    # Read from stdin, write to stdout
-    for line in sys.stdin:
-        try:
-            request = json.loads(line)
-            response = server.handle_request(request)
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
-        except json.JSONDecodeError:
-            sys.stderr.write(f"Error: Invalid JSON: {line}\n")
-            sys.stderr.flush()
-        except Exception as e:
-            sys.stderr.write(f"Error: {str(e)}\n")
-            sys.stderr.flush()
-
-
-def run_http_server():
-    """Run the HTTP server."""
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    # Read stdin on a background thread so requests the client has already
+    # pipelined can be answered together with a single write and flush
+    lines = queue.Queue()
+    threading.Thread(target=_read_stdin_lines, args=(lines,), daemon=True).start()
+    
+    # Bind the per-request lookups to locals once, outside the loop
+    get = lines.get
+    get_nowait = lines.get_nowait
+    empty = queue.Empty
+    process_line = _process_mcp_line
+    stdout = sys.stdout.buffer
+    max_batch_size = MCP_MAX_BATCH_SIZE
+    
+    end_of_input = False
+    while not end_of_input:
+        # Wait for the next request, then take any others already waiting
+        batch = [get()]
+        while len(batch) < max_batch_size:
+            try:
+                batch.append(get_nowait())
+            except empty:
+                break
+        
+        output = bytearray()
+        for line in batch:
+            if line is None:
+                end_of_input = True
+                break
+            response_body = process_line(server, line)
+            if response_body is not None:
+                output += response_body
+                output += b"\n"
+        
+        if output:
+            stdout.write(output)
+            stdout.flush()
+
+
+def _uvicorn_loop_and_http() -> Dict[str, str]:
+    """
+    Pick the event loop and HTTP parser implementations for uvicorn.
+    
+    uvloop and httptools (installed by uvicorn[standard]) are C-accelerated
+    and much faster than the pure-Python defaults. uvloop is not available
+    on Windows, so fall back to asyncio/h11 when either one is missing.
+    
+    Returns:
+        Keyword arguments for uvicorn.run.
+    """
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
+    return {"loop": loop, "http": http}
+
+
+def _default_worker_count() -> int:
+    """Use one HTTP worker process per CPU, up to four."""
+    return min(os.cpu_count() or 1, 4)
+
+
+def run_http_server(workers: int = 1):
+    """
+    Run the HTTP server.
+    
+    Args:
+        workers: Number of uvicorn worker processes. Script generation is
+            CPU-bound, so extra processes let requests run in parallel
+            instead of contending for one interpreter's GIL.
+    """
+    options = dict(
+        host="127.0.0.1",
+        port=8000,
+        log_level="info",
+        access_log=False,
+        **_uvicorn_loop_and_http(),
+    )
+    
+    if workers > 1:
+        # uvicorn can only spawn worker processes from an import string
+        uvicorn.run(
+            "main:app",
+            app_dir=os.path.dirname(os.path.abspath(__file__)),
+            workers=workers,
+            **options,
+        )
+    else:
+        uvicorn.run(app, **options)
 
 
 if __name__ == "__main__":
-    # Check if running in MCP mode
-    if len(sys.argv) > 1 and sys.argv[1] == "--mcp":
+    parser = argparse.ArgumentParser(description="Fusion 360 MCP Server")
+    parser.add_argument(
+        "--mcp", action="store_true", help="Run the MCP server over stdio"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=_default_worker_count(),
+        help="Number of HTTP worker processes (default: CPU count, up to 4)",
+    )
+    args = parser.parse_args()
+    
+    if args.mcp:
         run_mcp_server()
     else:
-        run_http_server()
+        run_http_server(workers=args.workers)
@@ -6,7 +6,9 @@ This module generates Fusion 360 Python scripts based on tool parameters.
 
 import json
 import os
-from typing import Dict, Any, List, Optional, Union
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Optional, Union
 
 # Import BMAD method reader
 from bmad_reader import bmad_reader
@@ -136,10 +138,63 @@ def run(context):
             ui.messageBox('Failed:\\n{{}}'.format(traceback.format_exc()))
 """
 
+# Lookup tables for tool options that map directly to generated code
+PLANE_CODES = {
+    "xy": ("xyPlane = component.xYConstructionPlane", "xyPlane"),
+    "yz": ("yzPlane = component.yZConstructionPlane", "yzPlane"),
+    "xz": ("xzPlane = component.xZConstructionPlane", "xzPlane"),
+}
+
+FEATURE_OPERATION_CODES = {
+    "new": "NewBody",
+    "join": "JoinFeature",
+    "cut": "CutFeature",
+    "intersect": "IntersectFeature",
+}
+
+COMBINE_OPERATION_CODES = {
+    "join": "JoinFeature",
+    "cut": "CutFeature",
+    "intersect": "IntersectFeature",
+}
+
+EXPORT_OPTIONS_CODES = {
+    "stl": "options = exportMgr.createSTLExportOptions(body)",
+    "obj": "options = exportMgr.createOBJExportOptions(body)",
+    "step": "options = exportMgr.createSTEPExportOptions()",
+    "iges": "options = exportMgr.createIGESExportOptions()",
+    "sat": "options = exportMgr.createSATExportOptions()",
+}
+
+# Generated single-tool scripts keyed by tool name and parameters, evicted
+# least recently used first
+SCRIPT_CACHE_MAX_SIZE = 1024
+_script_cache: "OrderedDict[str, str]" = OrderedDict()
+_script_cache_lock = threading.Lock()
+
+def _script_cache_key(tool_name: str, parameters: Dict[str, Any]) -> Optional[str]:
+    """
+    Build a stable cache key for a tool call.
+    
+    Args:
+        tool_name: The name of the tool.
+        parameters: The raw parameters provided for the tool.
+        
+    Returns:
+        The cache key, or None if the parameters are not JSON-serializable.
+    """
+    try:
+        return json.dumps([tool_name, parameters], sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+
 def generate_script(tool_name: str, parameters: Dict[str, Any]) -> str:
     """
     Generate a Fusion 360 Python script for the specified tool and parameters.
     
+    Repeated calls with the same tool name and parameters return the cached
+    script.
+    
     Args:
         tool_name: The name of the tool to generate a script for.
         parameters: A dictionary of parameter values for the tool.
@@ -147,6 +202,26 @@ def generate_script(tool_name: str, parameters: Dict[str, Any]) -> str:
     Returns:
         A string containing the generated Python script.
     """
+    key = _script_cache_key(tool_name, parameters)
+    if key is not None:
+        with _script_cache_lock:
+            script = _script_cache.get(key)
+            if script is not None:
+                _script_cache.move_to_end(key)
+                return script
+    
+    script = _generate_script(tool_name, parameters)
+    
+    if key is not None:
+        with _script_cache_lock:
+            _script_cache[key] = script
+            if len(_script_cache) > SCRIPT_CACHE_MAX_SIZE:
+                _script_cache.popitem(last=False)
+    
+    return script
+
+def _generate_script(tool_name: str, parameters: Dict[str, Any]) -> str:
+    """Generate a single-tool script without consulting the cache."""
     if tool_name not in TOOLS_BY_NAME:
         raise ValueError(f"Unknown tool: {tool_name}")
     
@@ -192,43 +267,15 @@ def _process_parameters(tool_name: str, parameters: Dict[str, Any]) -> Dict[str,
     # Tool-specific parameter processing
     if tool_name == "CreateSketch":
         plane = processed.get("plane", "xy").lower()
-        if plane == "xy":
-            processed["plane_code"] = "xyPlane = component.xYConstructionPlane"
-            processed["plane_var"] = "xyPlane"
-        elif plane == "yz":
-            processed["plane_code"] = "yzPlane = component.yZConstructionPlane"
-            processed["plane_var"] = "yzPlane"
-        elif plane == "xz":
-            processed["plane_code"] = "xzPlane = component.xZConstructionPlane"
-            processed["plane_var"] = "xzPlane"
-        else:
+        if plane not in PLANE_CODES:
             raise ValueError(f"Invalid plane: {plane}. Must be one of: xy, yz, xz")
+        processed["plane_code"], processed["plane_var"] = PLANE_CODES[plane]
     
-    elif tool_name == "Extrude":
-        operation = processed.get("operation", "new").lower()
-        if operation == "new":
-            processed["operation_code"] = "NewBody"
-        elif operation == "join":
-            processed["operation_code"] = "JoinFeature"
-        elif operation == "cut":
-            processed["operation_code"] = "CutFeature"
-        elif operation == "intersect":
-            processed["operation_code"] = "IntersectFeature"
-        else:
-            raise ValueError(f"Invalid operation: {operation}. Must be one of: new, join, cut, intersect")
-    
-    elif tool_name == "Revolve":
+    elif tool_name in ("Extrude", "Revolve"):
         operation = processed.get("operation", "new").lower()
-        if operation == "new":
-            processed["operation_code"] = "NewBody"
-        elif operation == "join":
-            processed["operation_code"] = "JoinFeature"
-        elif operation == "cut":
-            processed["operation_code"] = "CutFeature"
-        elif operation == "intersect":
-            processed["operation_code"] = "IntersectFeature"
-        else:
+        if operation not in FEATURE_OPERATION_CODES:
             raise ValueError(f"Invalid operation: {operation}. Must be one of: new, join, cut, intersect")
+        processed["operation_code"] = FEATURE_OPERATION_CODES[operation]
     
     elif tool_name == "Fillet":
         edge_indices = processed.get("edge_indices", [])
@@ -265,41 +312,27 @@ def _process_parameters(tool_name: str, parameters: Dict[str, Any]) -> Dict[str,
     
     elif tool_name == "Combine":
         operation = processed.get("operation", "join").lower()
-        if operation == "join":
-            processed["operation_code"] = "JoinFeature"
-        elif operation == "cut":
-            processed["operation_code"] = "CutFeature"
-        elif operation == "intersect":
-            processed["operation_code"] = "IntersectFeature"
-        else:
+        if operation not in COMBINE_OPERATION_CODES:
             raise ValueError(f"Invalid operation: {operation}. Must be one of: join, cut, intersect")
+        processed["operation_code"] = COMBINE_OPERATION_CODES[operation]
     
     elif tool_name == "ExportBody":
         format = processed.get("format", "stl").lower()
-        if format == "stl":
-            processed["export_options_code"] = "options = exportMgr.createSTLExportOptions(body)"
-        elif format == "obj":
-            processed["export_options_code"] = "options = exportMgr.createOBJExportOptions(body)"
-        elif format == "step":
-            processed["export_options_code"] = "options = exportMgr.createSTEPExportOptions()"
-        elif format == "iges":
-            processed["export_options_code"] = "options = exportMgr.createIGESExportOptions()"
-        elif format == "sat":
-            processed["export_options_code"] = "options = exportMgr.createSATExportOptions()"
-        else:
+        if format not in EXPORT_OPTIONS_CODES:
             raise ValueError(f"Invalid format: {format}. Must be one of: stl, obj, step, iges, sat")
+        processed["export_options_code"] = EXPORT_OPTIONS_CODES[format]
         
         # Set directory to the user's desktop by default
         processed["directory"] = os.path.expanduser("~/Desktop")
     
     return processed
 
-def generate_multi_tool_script(tool_calls: List[Dict[str, Any]]) -> str:
+def generate_multi_tool_script(tool_calls: Iterable[Dict[str, Any]]) -> str:
     """
     Generate a Fusion 360 Python script for multiple tool calls.
     
     Args:
-        tool_calls: A list of dictionaries, each containing 'tool_name' and 'parameters' keys.
+        tool_calls: An iterable of dictionaries, each containing 'tool_name' and 'parameters' keys.
         
     Returns:
         A string containing the generated Python script.
@@ -353,12 +386,13 @@ def generate_bmad_method_script(method_name: str, parameters: Dict[str, Any]) ->
     substituted_method = bmad_reader.substitute_parameters(method, parameters)
     
     # Convert method steps to tool calls
-    tool_calls = []
-    for step in substituted_method.get("steps", []):
-        tool_calls.append({
+    tool_calls = (
+        {
             "tool_name": step["tool"],
             "parameters": step.get("parameters", {})
-        })
+        }
+        for step in substituted_method.get("steps", [])
+    )
     
     # Generate script using the existing multi-tool generator
     return generate_multi_tool_script(tool_calls)
@@ -0,0 +1,99 @@
+"""
+Shared pytest configuration for the Fusion 360 MCP Server tests.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Add the src directory to the Python path once for every test module
+sys.path.insert(0, SRC_DIR)
+
+# Address the HTTP tests expect the server on
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000
+
+# Seconds to wait for a spawned server to accept connections
+SERVER_STARTUP_TIMEOUT = 15
+
+
+def _server_is_listening() -> bool:
+    """Check whether something accepts connections on the server port."""
+    try:
+        with socket.create_connection((SERVER_HOST, SERVER_PORT), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def _start_server() -> subprocess.Popen:
+    """
+    Start the HTTP server in a subprocess and wait until it accepts connections.
+    
+    Returns:
+        The server process.
+    """
+    # Log to a file rather than a pipe so a chatty server can never block
+    # on a full pipe buffer
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [sys.executable, "main.py", "--workers", "1"],
+        cwd=SRC_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=stderr,
+    )
+    
+    def startup_log() -> str:
+        stderr.seek(0)
+        return stderr.read().decode("utf-8", "replace")
+    
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    while not _server_is_listening():
+        if process.poll() is not None:
+            pytest.exit(
+                f"Server exited with code {process.returncode} during startup:\n{startup_log()}"
+            )
+        if time.monotonic() > deadline:
+            _stop_server(process)
+            pytest.exit(f"Timed out waiting for the server to start:\n{startup_log()}")
+        time.sleep(0.05)
+    
+    return process
+
+
+def _stop_server(process: subprocess.Popen) -> None:
+    """Terminate the server process, killing it if it does not exit."""
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def pytest_configure(config):
+    """
+    Make sure the HTTP server is running for the whole test session.
+    
+    An already running server is reused. Otherwise one is started before
+    any test runs and stopped when the session ends. Under pytest-xdist
+    only the controlling process starts the server, before its workers
+    exist, and the workers share it.
+    """
+    if hasattr(config, "workerinput") or _server_is_listening():
+        return
+    config._fusion360_server = _start_server()
+
+
+def pytest_unconfigure(config):
+    """Stop the server started by pytest_configure, if any."""
+    process = getattr(config, "_fusion360_server", None)
+    if process is not None:
+        _stop_server(process)
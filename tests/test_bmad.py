@@ -5,19 +5,21 @@ Test script for BMAD functionality in the Fusion 360 MCP Server.
 
 import json
 import os
-import sys
+import tempfile
 import requests
 from typing import Dict, Any, List
 
-# Add the src directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from bmad_reader import BMADMethodReader
 
 # Server URL
 SERVER_URL = "http://127.0.0.1:8000"
 
+# Shared session so the tests reuse keep-alive connections
+session = requests.Session()
+
 def test_list_bmad_folders():
     """Test the list BMAD folders endpoint."""
-    response = requests.get(f"{SERVER_URL}/bmad/folders")
+    response = session.get(f"{SERVER_URL}/bmad/folders")
     assert response.status_code == 200
     data = response.json()
     assert "folders" in data
@@ -28,7 +30,7 @@ def test_list_bmad_folders():
 
 def test_list_bmad_methods():
     """Test the list BMAD methods endpoint."""
-    response = requests.get(f"{SERVER_URL}/bmad/methods")
+    response = session.get(f"{SERVER_URL}/bmad/methods")
     assert response.status_code == 200
     data = response.json()
     assert "methods" in data
@@ -45,7 +47,7 @@ def test_list_bmad_methods():
 def test_list_bmad_methods_by_category():
     """Test filtering BMAD methods by category."""
     # Test basic category
-    response = requests.get(f"{SERVER_URL}/bmad/methods?category=basic")
+    response = session.get(f"{SERVER_URL}/bmad/methods?category=basic")
     assert response.status_code == 200
     data = response.json()
     assert "methods" in data
@@ -68,7 +70,7 @@ def test_call_bmad_method():
             "height": 10
         }
     }
-    response = requests.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
+    response = session.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
     assert response.status_code == 200
     data = response.json()
     assert "script" in data
@@ -76,9 +78,9 @@ def test_call_bmad_method():
     
     # Check that the script contains expected content
     script = data["script"]
-    assert "sketch" in script.lower()
-    assert "rectangle" in script.lower()  
-    assert "extrude" in script.lower()
+    script_lower = script.lower()
+    for keyword in ("sketch", "rectangle", "extrude"):
+        assert keyword in script_lower
     assert "20" in script  # width parameter
     assert "30" in script  # depth parameter
     assert "10" in script  # height parameter
@@ -95,7 +97,7 @@ def test_call_bmad_method_with_defaults():
             "height": 8
         }
     }
-    response = requests.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
+    response = session.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
     assert response.status_code == 200
     data = response.json()
     assert "script" in data
@@ -113,13 +115,85 @@ def test_call_bmad_method_error_handling():
         "method_name": "NonExistentMethod",
         "parameters": {}
     }
-    response = requests.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
+    response = session.post(f"{SERVER_URL}/bmad/call_method", json=request_data)
     assert response.status_code == 400
     data = response.json()
     assert "detail" in data
     assert "Unknown BMAD method" in data["detail"]
     print("✅ BMAD method error handling test passed")
 
+def _write_method(folder: str, file_name: str, name: str, category: str, description: str) -> str:
+    """Write a minimal BMAD method file and return its path."""
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, file_name)
+    method = {
+        "name": name,
+        "description": description,
+        "category": category,
+        "steps": [],
+    }
+    with open(path, "w") as f:
+        json.dump(method, f)
+    return path
+
+def test_bmad_reader_cache_refresh():
+    """Test that the BMAD method cache picks up edited, added and removed method files."""
+    with tempfile.TemporaryDirectory() as methods_folder:
+        basic_folder = os.path.join(methods_folder, "basic")
+        advanced_folder = os.path.join(methods_folder, "advanced")
+        box_path = _write_method(basic_folder, "box.json", "Box", "basic", "A box")
+        reader = BMADMethodReader(methods_folder)
+        
+        methods = reader.read_all_methods()
+        assert list(methods) == ["Box"]
+        
+        # Unchanged files are served from the cache
+        assert reader.read_all_methods() is methods
+        
+        # Edited file, with the modification time set explicitly so the
+        # change is visible even on filesystems with coarse timestamps
+        _write_method(basic_folder, "box.json", "Box", "basic", "An edited box")
+        stat = os.stat(box_path)
+        os.utime(box_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert reader.get_method("Box")["description"] == "An edited box"
+        
+        # Added file, in a new folder and category
+        _write_method(advanced_folder, "tube.json", "Tube", "advanced", "A tube")
+        assert sorted(reader.read_all_methods()) == ["Box", "Tube"]
+        assert [m["name"] for m in reader.list_methods_by_category("advanced")] == ["Tube"]
+        assert reader.get_method("Tube")["folder"] == "advanced"
+        
+        # Removed file
+        os.remove(box_path)
+        assert list(reader.read_all_methods()) == ["Tube"]
+        assert reader.list_methods_by_category("basic") == []
+        assert [m["name"] for m in reader.list_methods_by_category()] == ["Tube"]
+    
+    print("✅ BMAD reader cache refresh test passed")
+
+def test_bmad_reader_skips_broken_files():
+    """Test that a broken method file does not hide the other methods in its folder."""
+    with tempfile.TemporaryDirectory() as methods_folder:
+        basic_folder = os.path.join(methods_folder, "basic")
+        os.makedirs(basic_folder)
+        
+        # Create the broken files first so directory listings tend to
+        # return them ahead of the valid ones
+        os.symlink(
+            os.path.join(methods_folder, "missing.json"),
+            os.path.join(basic_folder, "dangling.json"),
+        )
+        with open(os.path.join(basic_folder, "invalid.json"), "w") as f:
+            f.write("{not json")
+        names = ["Box", "Cone", "Cylinder", "Sphere", "Torus"]
+        for name in names:
+            _write_method(basic_folder, f"{name.lower()}.json", name, "basic", f"A {name.lower()}")
+        reader = BMADMethodReader(methods_folder)
+        
+        assert sorted(reader.read_all_methods()) == names
+    
+    print("✅ BMAD reader broken files test passed")
+
 def run_bmad_tests():
     """Run all BMAD tests."""
     print("🧪 Running BMAD tests for Fusion 360 MCP Server...")
@@ -130,6 +204,8 @@ def run_bmad_tests():
         test_call_bmad_method()
         test_call_bmad_method_with_defaults()
         test_call_bmad_method_error_handling()
+        test_bmad_reader_cache_refresh()
+        test_bmad_reader_skips_broken_files()
         print("✅ All BMAD tests passed!")
     except requests.exceptions.ConnectionError:
         print("❌ Failed to connect to the server. Make sure the server is running.")
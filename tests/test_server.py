@@ -7,16 +7,19 @@ This script tests the server by making HTTP requests to the API endpoints.
 
 import json
 import os
+import subprocess
 import sys
 import requests
 from typing import Dict, Any, List
 
-# Add the src directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import script_generator
 
 # Server URL
 SERVER_URL = "http://127.0.0.1:8000"
 
+# Directory containing main.py, for running the MCP server over stdio
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
 def test_root():
     """Test the root endpoint."""
     response = requests.get(f"{SERVER_URL}/")
@@ -35,6 +38,15 @@ def test_list_tools():
     assert len(data["tools"]) > 0
     print(f"✅ List tools test passed ({len(data['tools'])} tools found)")
 
+def test_list_tools_gzip():
+    """Test that the tool list is gzip-compressed for clients that accept it."""
+    response = requests.get(f"{SERVER_URL}/tools", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers.get("Content-Encoding") == "gzip"
+    data = response.json()
+    assert len(data["tools"]) > 0
+    print("✅ List tools gzip test passed")
+
 def test_call_tool():
     """Test the call_tool endpoint."""
     # Test CreateSketch
@@ -83,6 +95,26 @@ def test_call_tool():
     assert "Extrude" in data["script"]
     print("✅ Call tool (Extrude) test passed")
 
+def test_call_tool_text_format():
+    """Test the call_tool endpoint returning the script as plain text."""
+    request_data = {
+        "tool_name": "CreateSketch",
+        "parameters": {
+            "plane": "xy"
+        }
+    }
+    response = requests.post(f"{SERVER_URL}/call_tool?format=text", json=request_data)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert response.headers.get("X-Status") == "Success"
+    assert response.text.startswith("import adsk.core")
+    assert "xyPlane" in response.text
+    
+    # Unknown formats are rejected instead of silently returning JSON
+    response = requests.post(f"{SERVER_URL}/call_tool?format=txt", json=request_data)
+    assert response.status_code == 422
+    print("✅ Call tool (text format) test passed")
+
 def test_call_tools():
     """Test the call_tools endpoint."""
     request_data = {
@@ -118,14 +150,134 @@ def test_call_tools():
     assert "Extrude" in data["script"]
     print("✅ Call tools test passed")
 
+def test_call_tools_batch():
+    """Test the call_tools_batch endpoint with a mix of valid and invalid calls."""
+    request_data = {
+        "tool_calls": [
+            {
+                "tool_name": "CreateSketch",
+                "parameters": {
+                    "plane": "xy"
+                }
+            },
+            {
+                "tool_name": "NonExistentTool",
+                "parameters": {}
+            },
+            {
+                "tool_name": "DrawCircle",
+                "parameters": {}
+            }
+        ]
+    }
+    response = requests.post(f"{SERVER_URL}/call_tools_batch", json=request_data)
+    assert response.status_code == 200
+    data = response.json()
+    assert "results" in data
+    assert len(data["results"]) == 3
+    
+    # Results keep the order of the requested calls
+    success, unknown_tool, missing_parameter = data["results"]
+    assert success["status"] == 200
+    assert success["error"] is None
+    assert "xyPlane" in success["script"]
+    
+    assert unknown_tool["status"] == 400
+    assert unknown_tool["script"] is None
+    assert "Unknown tool" in unknown_tool["error"]
+    
+    # A failed call reports its own error without failing the whole batch
+    assert missing_parameter["status"] != 200
+    assert missing_parameter["script"] is None
+    assert missing_parameter["error"]
+    print("✅ Call tools batch test passed")
+
+def test_call_tools_batch_too_large():
+    """Test that call_tools_batch rejects batches over the size limit."""
+    request_data = {
+        "tool_calls": [
+            {
+                "tool_name": "CreateSketch",
+                "parameters": {
+                    "plane": "xy"
+                }
+            }
+        ] * 101
+    }
+    response = requests.post(f"{SERVER_URL}/call_tools_batch", json=request_data)
+    assert response.status_code == 422
+    print("✅ Call tools batch size limit test passed")
+
+def test_mcp_stdio():
+    """Test that the MCP server answers piped requests in order over stdio."""
+    request_lines = [
+        json.dumps({"method": "list_tools"}),
+        json.dumps({"method": "call_tool", "params": {"name": "CreateSketch", "arguments": {"plane": "xy"}}}),
+        "not json",
+        json.dumps({"method": "call_tool", "params": {"name": "NonExistentTool"}}),
+        json.dumps({"method": "call_tool", "params": {"name": "BMAD_SimpleBox", "arguments": {"width": 10, "depth": 20, "height": 5}}}),
+    ]
+    process = subprocess.run(
+        [sys.executable, "main.py", "--mcp"],
+        cwd=SRC_DIR,
+        input="\n".join(request_lines) + "\n",
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    assert process.returncode == 0
+    
+    # The invalid JSON line is reported on stderr and gets no response
+    responses = [json.loads(line) for line in process.stdout.splitlines()]
+    assert len(responses) == 4
+    assert "Invalid JSON" in process.stderr
+    
+    tools, sketch, unknown_tool, bmad = responses
+    assert len(tools["result"]["tools"]) > 0
+    assert "xyPlane" in sketch["result"]["content"][0]["text"]
+    assert unknown_tool["error"]["code"] == -32602
+    assert "unknown tool" in unknown_tool["error"]["message"]
+    assert "addTwoPointRectangle" in bmad["result"]["content"][0]["text"]
+    print("✅ MCP stdio test passed")
+
+def test_script_cache():
+    """Test that generated scripts are cached and evicted least recently used first."""
+    original_max_size = script_generator.SCRIPT_CACHE_MAX_SIZE
+    script_generator.SCRIPT_CACHE_MAX_SIZE = 2
+    script_generator._script_cache.clear()
+    try:
+        xy_script = script_generator.generate_script("CreateSketch", {"plane": "xy"})
+        assert script_generator.generate_script("CreateSketch", {"plane": "xy"}) is xy_script
+        
+        script_generator.generate_script("CreateSketch", {"plane": "yz"})
+        
+        # Use the xy script again so the yz script is the least recently used
+        script_generator.generate_script("CreateSketch", {"plane": "xy"})
+        script_generator.generate_script("CreateSketch", {"plane": "xz"})
+        
+        assert len(script_generator._script_cache) == 2
+        assert script_generator.generate_script("CreateSketch", {"plane": "xy"}) is xy_script
+        cached_planes = [json.loads(key)[1]["plane"] for key in script_generator._script_cache]
+        assert sorted(cached_planes) == ["xy", "xz"]
+    finally:
+        script_generator.SCRIPT_CACHE_MAX_SIZE = original_max_size
+        script_generator._script_cache.clear()
+    print("✅ Script cache test passed")
+
 def run_tests():
     """Run all tests."""
     print("🧪 Running tests for Fusion 360 MCP Server...")
     try:
         test_root()
         test_list_tools()
+        test_list_tools_gzip()
         test_call_tool()
+        test_call_tool_text_format()
         test_call_tools()
+        test_call_tools_batch()
+        test_call_tools_batch_too_large()
+        test_mcp_stdio()
+        test_script_cache()
         print("✅ All tests passed!")
     except requests.exceptions.ConnectionError:
         print("❌ Failed to connect to the server. Make sure the server is running.")